@@ -1,163 +1,642 @@
 import os
 import sys
 import subprocess
-from moviepy.editor import *
+import shutil
+import json
+import functools
+import tempfile
+import atexit
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import filedialog, messagebox, simpledialog, ttk
+from tkinter import font as tkfont
 import re
+import operator
 import platform
-from PIL import Image
-import numpy as np
-import psutil
-import io
 import threading
+import queue
 import time
 
-class StdoutRedirector(io.StringIO):
-    def __init__(self, write_func, progress_func):
-        self.write_func = write_func
-        self.progress_func = progress_func
-        super().__init__()
+# PIL se importa de forma diferida dentro de crear_video: cargarlo en el
+# arranque retrasa la interfaz y solo hace falta en el camino de respaldo
 
-    def write(self, string):
-        self.write_func(string.strip())
-        if string.startswith('t:'):
+# libx264/x265 escalan de forma sublineal pasados ~4 hilos: limitar los hilos
+# por codificación deja núcleos libres para trabajos simultáneos. Las etapas
+# ligadas a CPU (codificar) se limitan a dos a la vez como mucho; las ligadas
+# a E/S (sondeos) van por el executor, que tiene su propia política
+HILOS_POR_TRABAJO = 4
+MAX_TRABAJOS_PARALELOS = min(2, max(1, (os.cpu_count() or 1) // HILOS_POR_TRABAJO))
+_semaforo_trabajos = threading.BoundedSemaphore(MAX_TRABAJOS_PARALELOS)
+
+# Máximo de líneas retenidas en el panel de información: el coste de cada
+# inserción en un tk.Text crece con el contenido acumulado
+MAX_LINEAS_INFO = 1000
+
+# En POSIX, el close_fds por defecto recorre los descriptores hasta el rlimit
+# en cada lanzamiento, y además inhibe la vía rápida posix_spawn; a ffmpeg y
+# ffprobe no se les filtra nada sensible, así que puede desactivarse. En
+# Windows no aplica (los handles no se heredan sin pedirlo).
+OPCIONES_SPAWN = {'close_fds': False} if os.name == 'posix' else {}
+
+_RE_DURACION = re.compile(r'Duration:\s*(\d+):(\d{2}):(\d{2})(?:\.(\d+))?')
+_RE_NUM = re.compile(r'(\d+)')
+# En bytes: stderr se consume sin decodificar y solo se decodifica lo que
+# de verdad se reenvía a la interfaz
+_RE_RELEVANTE = re.compile(rb'frame=|time=|bitrate=|speed=')
+
+def encontrar_ffmpeg():
+    # Primero el binario que acompaña a imageio-ffmpeg, después el del PATH
+    candidatos = []
+    try:
+        import imageio_ffmpeg
+        candidatos.append(imageio_ffmpeg.get_ffmpeg_exe())
+    except Exception:
+        pass
+    ruta_which = shutil.which('ffmpeg')
+    if ruta_which:
+        candidatos.append(ruta_which)
+    for ruta in candidatos:
+        # Un solo stat responde existencia y permisos; chmod solo si falta
+        # el bit de ejecución
+        try:
+            st = os.stat(ruta)
+        except OSError:
+            continue
+        if os.name == 'posix' and not (st.st_mode & 0o111):
             try:
-                progress = float(string.split()[1])
-                self.progress_func(progress)
-            except:
-                pass
+                os.chmod(ruta, st.st_mode | 0o755)
+            except OSError:
+                continue
+        return ruta
+    return 'ffmpeg'
+
+FFMPEG_PATH = encontrar_ffmpeg()
 
+@functools.lru_cache(maxsize=4096)
 def obtener_numero_pista(nombre_archivo):
-    match = re.search(r'^(\d+)', os.path.splitext(nombre_archivo)[0])
+    # Devuelve una tupla comparable en C por Timsort: primero las pistas con
+    # número (ordenadas por él) y después el resto en orden alfabético
+    nombre_base = os.path.splitext(nombre_archivo)[0]
+    # match ancla en el inicio sin necesitar un patrón aparte con ^
+    match = _RE_NUM.match(nombre_base) or _RE_NUM.search(nombre_base)
     if match:
-        return int(match.group(1))
-    match = re.search(r'(\d+)', os.path.splitext(nombre_archivo)[0])
-    if match:
-        return int(match.group(1))
-    return nombre_archivo
+        return (0, int(match.group(1)), nombre_base)
+    return (1, 0, nombre_base)
+
+def encontrar_ffprobe():
+    # Busca un ffprobe real en el PATH; si no existe se omite el sondeo de metadatos
+    return shutil.which('ffprobe')
+
+FFPROBE_PATH = encontrar_ffprobe()
+
+@functools.lru_cache(maxsize=1024)
+def _duracion_cacheada(archivo_path, mtime, tamano):
+    # La clave (ruta, mtime, tamaño) permite reutilizar el resultado entre regeneraciones
+    if FFPROBE_PATH is not None:
+        # default=nw=1:nk=1 imprime el número a secas: un float() directo
+        # sin construir ni parsear un documento JSON por archivo
+        cmd = [FFPROBE_PATH, '-v', 'error', '-show_entries', 'format=duration',
+               '-of', 'default=nw=1:nk=1', archivo_path]
+        try:
+            resultado = subprocess.run(cmd, stdin=subprocess.DEVNULL,
+                                       stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                       text=True, timeout=30, **OPCIONES_SPAWN)
+            if resultado.returncode == 0:
+                return float(resultado.stdout.strip())
+        except Exception:
+            pass
+    # Sin ffprobe: la cabecera "Duration:" de ffmpeg también evita decodificar
+    try:
+        resultado = subprocess.run([FFMPEG_PATH, '-hide_banner', '-i', archivo_path],
+                                   stdin=subprocess.DEVNULL,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                   text=True, timeout=30, **OPCIONES_SPAWN)
+        match = _RE_DURACION.search(resultado.stderr)
+        if match:
+            horas, minutos, segundos, fraccion = match.groups()
+            return (int(horas) * 3600 + int(minutos) * 60 + int(segundos)
+                    + float(f'0.{fraccion}' if fraccion else 0))
+    except Exception:
+        pass
+    return None
+
+@functools.lru_cache(maxsize=1024)
+def _formato_audio_cacheado(archivo_path, mtime, tamano):
+    if not FFPROBE_PATH:
+        return None
+    cmd = [FFPROBE_PATH, '-v', 'error', '-select_streams', 'a:0',
+           '-show_entries', 'stream=codec_name,sample_rate,channels',
+           '-of', 'default=nw=1:nk=1', archivo_path]
+    try:
+        resultado = subprocess.run(cmd, stdin=subprocess.DEVNULL,
+                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                   text=True, timeout=30, **OPCIONES_SPAWN)
+        if resultado.returncode == 0:
+            partes = resultado.stdout.split()
+            if len(partes) == 3:
+                return tuple(partes)
+    except Exception:
+        pass
+    return None
+
+def obtener_formato_audio(archivo_path):
+    try:
+        st = os.stat(archivo_path)
+    except OSError:
+        return None
+    return _formato_audio_cacheado(archivo_path, st.st_mtime, st.st_size)
+
+def puede_copiar_audio(rutas_audio):
+    # Si todas las pistas ya son AAC con los mismos parámetros, el demuxer
+    # concat admite copiar el flujo tal cual: se evita el ciclo completo
+    # AAC→PCM→AAC. La extensión filtra primero para no sondear en vano.
+    if not all(ruta.rpartition('.')[2].lower() in ('aac', 'm4a') for ruta in rutas_audio):
+        return False
+    formatos = list(_obtener_executor().map(obtener_formato_audio, rutas_audio))
+    primero = formatos[0]
+    return (primero is not None and primero[0] == 'aac'
+            and all(formato == primero for formato in formatos))
 
-def procesar_audio(archivo_path):
+def obtener_duracion_audio(archivo_path):
+    # Lee solo la cabecera del contenedor: no decodifica el audio completo
     try:
-        return AudioFileClip(archivo_path)
-    except Exception as e:
-        print(f"No se pudo cargar el archivo {archivo_path}: {str(e)}")
+        st = os.stat(archivo_path)
+    except OSError:
         return None
+    return _duracion_cacheada(archivo_path, st.st_mtime, st.st_size)
+
+_executor_sondeos = None
+_executor_lock = threading.Lock()
+
+def _obtener_executor():
+    # Executor compartido de creación perezosa: una generación tras otra
+    # reutiliza los mismos hilos en vez de crearlos y destruirlos por lote
+    global _executor_sondeos
+    if _executor_sondeos is None:
+        with _executor_lock:
+            if _executor_sondeos is None:
+                # Los sondeos esperan E/S (cabeceras de archivo), no CPU:
+                # más hilos que núcleos ayuda, pero con tope para que el
+                # coste de arrancar subprocesos no domine
+                _executor_sondeos = ThreadPoolExecutor(
+                    max_workers=min(16, (os.cpu_count() or 1) * 4),
+                    thread_name_prefix='vg')
+    return _executor_sondeos
+
+def calcular_duracion_total(rutas_audio):
+    if not rutas_audio:
+        return None
+    # Los sondeos son trabajo de E/S independiente: se lanzan en paralelo
+    duraciones = list(_obtener_executor().map(obtener_duracion_audio, rutas_audio))
+    if any(d is None for d in duraciones):
+        return None
+    return sum(duraciones)
+
+def verificar_capacidades():
+    # Sondear -encoders cuesta un fork+exec y ~50 KB de salida: el resultado
+    # vive en un pool en memoria clave (ruta, mtime, tamaño) respaldado por
+    # un cache JSON en disco, de modo que ni las llamadas repetidas en el
+    # proceso ni los arranques posteriores vuelven a sondear el binario
+    try:
+        st = os.stat(FFMPEG_PATH)
+    except OSError:
+        return {'disponible': False, 'h264_amf': False, 'hevc_amf': False}
+    return _sondear_capacidades(FFMPEG_PATH, st.st_mtime, st.st_size)
+
+@functools.lru_cache(maxsize=4)
+def _sondear_capacidades(ruta_ffmpeg, mtime, tamano):
+    capacidades = {'disponible': False, 'h264_amf': False, 'hevc_amf': False,
+                   'libfdk_aac': False}
+    clave = [ruta_ffmpeg, mtime, tamano]
+
+    ruta_cache = os.path.join(tempfile.gettempdir(), 'videogenerator_caps.json')
+    try:
+        with open(ruta_cache, encoding='utf-8') as f:
+            datos = json.load(f)
+        # Un caché de una versión anterior puede no traer todas las claves
+        if datos.get('clave') == clave and datos['capacidades'].keys() >= capacidades.keys():
+            return datos['capacidades']
+    except Exception:
+        pass
+
+    try:
+        # Listar codificadores no toca ningún medio: si tarda más de unos
+        # segundos es que el binario está colgado, no ocupado
+        resultado = subprocess.run([ruta_ffmpeg, '-hide_banner', '-encoders'],
+                                   stdin=subprocess.DEVNULL,
+                                   stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                   text=True, timeout=5, **OPCIONES_SPAWN)
+        if resultado.returncode == 0:
+            capacidades['disponible'] = True
+            capacidades['h264_amf'] = 'h264_amf' in resultado.stdout
+            capacidades['hevc_amf'] = 'hevc_amf' in resultado.stdout
+            capacidades['libfdk_aac'] = 'libfdk_aac' in resultado.stdout
+        del resultado  # libera el listado completo; solo importan los booleanos
+    except Exception:
+        return capacidades
+
+    try:
+        with open(ruta_cache, 'w', encoding='utf-8') as f:
+            json.dump({'clave': clave, 'capacidades': capacidades}, f)
+    except OSError:
+        pass
+    return capacidades
+
+def _drenar_stderr(tuberia, cola, ultimas):
+    # Consume stderr en un hilo propio: si la tubería se llena, FFmpeg se
+    # bloquea. Las líneas útiles se publican en una cola acotada que el hilo
+    # de trabajo vacía a su ritmo; así el caudal de stderr nunca marca el
+    # ritmo de la interfaz. Las últimas líneas se retienen aparte para poder
+    # componer un error con contexto si FFmpeg falla.
+    ultimo_log = 0.0
+    try:
+        for linea in tuberia:
+            linea = linea.strip()
+            if not linea:
+                continue
+            ultimas.append(linea)  # en bytes: solo se decodifica si hay error
+            if _RE_RELEVANTE.search(linea):
+                ahora = time.monotonic()
+                if ahora - ultimo_log < 0.2:
+                    continue
+                ultimo_log = ahora
+            try:
+                # Decodificación perezosa: solo las líneas que superan el
+                # filtro y la limitación de ritmo llegan a convertirse en str
+                cola.put_nowait(linea.decode('utf-8', 'replace'))
+            except queue.Full:
+                pass
+    except Exception:
+        pass
+
+def _escribir_ppm(fondo, ruta):
+    # PPM binario (P6): cabecera ASCII + píxeles rgb24 tal cual
+    with open(ruta, 'wb') as f:
+        f.write(f'P6\n{fondo.width} {fondo.height}\n255\n'.encode('ascii'))
+        f.write(fondo.tobytes())
+
+def _ejecutar_ffmpeg(cmd, datos_entrada, duracion_total, add_info, update_progress):
+    # Lanza FFmpeg, alimenta stdin si procede y traduce el flujo -progress
+    # a la barra de la interfaz. Devuelve (código de salida, entrada_ok,
+    # últimas líneas de stderr)
+    # Tuberías en binario: FFmpeg emite megabytes de ruido por stderr y
+    # validarlo como UTF-8 línea a línea es trabajo tirado
+    proceso = subprocess.Popen(cmd,
+                               stdin=subprocess.PIPE if datos_entrada is not None else subprocess.DEVNULL,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               **OPCIONES_SPAWN)
+    entrada_ok = True
+    if datos_entrada is not None:
+        try:
+            proceso.stdin.write(datos_entrada)
+            proceso.stdin.close()
+        except (BrokenPipeError, OSError):
+            entrada_ok = False
+
+    cola_err = queue.Queue(maxsize=256)
+    ultimas = deque(maxlen=64)
+    hilo_stderr = threading.Thread(target=_drenar_stderr,
+                                   args=(proceso.stderr, cola_err, ultimas), daemon=True)
+    hilo_stderr.start()
+
+    def vaciar_cola_err():
+        while True:
+            try:
+                add_info(cola_err.get_nowait())
+            except queue.Empty:
+                return
+
+    # out_time_us es un entero en microsegundos: progreso sin regex
+    for linea in proceso.stdout:
+        vaciar_cola_err()
+        if linea.startswith(b'out_time_us=') and update_progress:
+            try:
+                # UnicodeDecodeError es subclase de ValueError
+                transcurrido = int(linea[12:].decode('ascii')) / 1_000_000
+            except ValueError:
+                continue
+            update_progress(35 + min(transcurrido / duracion_total, 1.0) * 65)
+        elif linea.startswith(b'progress=end') and update_progress:
+            # Señal explícita de fin del protocolo -progress: completa la
+            # barra aunque el último out_time_us se quedara corto
+            update_progress(100)
+
+    retorno = proceso.wait()
+    hilo_stderr.join(timeout=5)
+    vaciar_cola_err()
+    return retorno, entrada_ok, ultimas
+
+@functools.lru_cache(maxsize=1)
+def _directorio_temporal():
+    # Un único directorio temporal por proceso, creado en el primer uso y
+    # eliminado al salir; las generaciones sucesivas lo reutilizan
+    ruta = tempfile.mkdtemp(prefix='videogenerator_')
+    atexit.register(shutil.rmtree, ruta, ignore_errors=True)
+    return ruta
+
+def _borrar_temporales(rutas):
+    # Punto único para los borrados de fin de trabajo; acepta None en la
+    # lista para que el llamador no tenga que filtrar rutas opcionales
+    for ruta in rutas:
+        if ruta:
+            try:
+                os.unlink(ruta)
+            except OSError:
+                pass
+
+def limpiar_temporales():
+    # Los directorios de ejecuciones que terminaron mal no pasan por el
+    # atexit: barrerlos al arrancar. DirEntry.is_dir usa el stat que el
+    # propio scandir ya hizo, sin una segunda llamada por entrada.
+    eliminados = 0
+    try:
+        with os.scandir(tempfile.gettempdir()) as it:
+            for entrada in it:
+                if not entrada.name.startswith('videogenerator_'):
+                    continue
+                if not entrada.is_dir(follow_symlinks=False):
+                    continue  # conserva videogenerator_caps.json
+                shutil.rmtree(entrada.path, ignore_errors=True)
+                eliminados += 1
+    except OSError:
+        pass
+    return eliminados
+
+def escribir_lista_concat(rutas_audio, lista_path):
+    # Manifiesto para el demuxer concat de FFmpeg: se construye en memoria y
+    # se escribe en binario con una sola llamada, sin TextIOWrapper por línea
+    datos = ''.join("file '%s'\n" % ruta.replace("'", "'\\''")
+                    for ruta in rutas_audio).encode('utf-8')
+    # os.open/os.write: un write del buffer completo, sin capa de E/S
+    # bufferizada por medio
+    fd = os.open(lista_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, datos)
+    finally:
+        os.close(fd)
+
+FORMATOS_AUDIO = frozenset(('mp3', 'wav', 'ogg', 'flac', 'aac', 'm4a', 'wma'))
+
+# Correspondencia única entre la opción de la interfaz y el encoder AMF;
+# la comprobación de disponibilidad y los parámetros salen del mismo sitio
+ENCODERS_AMF = {'h264': 'h264_amf', 'h265': 'hevc_amf'}
+
+# Formatos de imagen que FFmpeg decodifica directamente: para estos no hace
+# falta la pasada previa por PIL, el escalado ocurre dentro del filtergraph
+FORMATOS_IMAGEN_FFMPEG = frozenset(('jpg', 'jpeg', 'png', 'bmp', 'webp', 'tif', 'tiff'))
 
-def crear_video(directorio_audio, imagen_path, output_path, codec='none', add_info=print, update_progress=None):
-    formatos_audio = ['.mp3', '.wav', '.ogg', '.flac', '.aac', '.m4a', '.wma']
-    archivos_audio = [f for f in os.listdir(directorio_audio) if os.path.splitext(f.lower())[1] in formatos_audio]
-    
-    archivos_audio.sort(key=obtener_numero_pista)
-    
-    add_info("Orden de los archivos de audio:")
-    for archivo in archivos_audio:
-        add_info(f"{obtener_numero_pista(archivo)}: {archivo}")
-
-    clips_audio = []
-    for i, archivo in enumerate(archivos_audio):
-        clip = procesar_audio(os.path.join(directorio_audio, archivo))
-        if clip is not None:
-            clips_audio.append(clip)
-        add_info(f"Procesado: {archivo}")
-        if update_progress:
-            update_progress(i / len(archivos_audio) * 30)  # 30% del progreso para procesar audio
-
-    audio_final = concatenate_audioclips(clips_audio)
-
-    add_info("Procesando imagen...")
-
-    imagen_pil = Image.open(imagen_path)
+RUTA_CONFIG = os.path.join(os.path.expanduser('~'), '.videogenerator.json')
+
+def enviar_notificacion(titulo, mensaje):
+    # Notificación del sistema sin interpolar texto en el script: los
+    # argumentos viajan por argv, de modo que los nombres de archivo con
+    # comillas no rompen el comando ni necesitan escapado
+    if sys.platform == 'darwin':
+        cmd = ['osascript',
+               '-e', 'on run argv',
+               '-e', 'display notification item 1 of argv with title item 2 of argv',
+               '-e', 'end run',
+               mensaje, titulo]
+    elif sys.platform.startswith('linux'):
+        cmd = ['notify-send', titulo, mensaje]
+    else:
+        # En Windows el messagebox de la aplicación ya cumple ese papel
+        return
+    try:
+        # Lanzar y olvidar: no hay nada que hacer con el resultado y esperar
+        # al demonio de notificaciones retrasaría el diálogo de éxito
+        subprocess.Popen(cmd, stdin=subprocess.DEVNULL,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except Exception:
+        pass
+
+def crear_video(directorio_audio, imagen_path, output_path, codec='none', calidad='balanced', add_info=print, update_progress=None):
+    # Un único recorrido: scandir reutiliza el stat del DirEntry, rpartition
+    # evita crear rutas y la clave de orden se calcula aquí mismo una sola vez
+    with os.scandir(directorio_audio) as it:
+        claves = [(obtener_numero_pista(e.name), e.name) for e in it
+                  if e.is_file(follow_symlinks=False)
+                  and e.name.rpartition('.')[2].lower() in FORMATOS_AUDIO]
+
+    if not claves:
+        raise Exception("No se encontraron archivos de audio en el directorio")
+
+    claves.sort(key=operator.itemgetter(0))
+    archivos_audio = [nombre for _, nombre in claves]
+
+    # Un solo mensaje para todo el listado: con cien pistas serían cien
+    # callbacks hacia la interfaz por un único evento lógico
+    lineas = ["Orden de los archivos de audio:"]
+    for clave, archivo in claves:
+        etiqueta = clave[1] if clave[0] == 0 else archivo
+        lineas.append(f"{etiqueta}: {archivo}")
+    add_info('\n'.join(lineas))
+
+    rutas_audio = [os.path.join(directorio_audio, archivo) for archivo in archivos_audio]
+
+    # Sondear la duración total leyendo solo metadatos (sin decodificar)
+    duracion_total = calcular_duracion_total(rutas_audio)
+    if not duracion_total:
+        raise Exception("No se pudo determinar la duración de los archivos de audio")
+    add_info(f"Duración total estimada: {duracion_total:.1f} segundos")
+    if update_progress:
+        update_progress(10)
+
+    # Si FFmpeg entiende el formato, la imagen original entra directa y el
+    # escalado/letterboxing se hace dentro del filtergraph (swscale SIMD),
+    # sin decodificar ni recomprimir nada en Python. La pasada por PIL
+    # queda solo para formatos que FFmpeg no decodifica.
+    extension_imagen = imagen_path.rpartition('.')[2].lower()
+    usar_imagen_directa = extension_imagen in FORMATOS_IMAGEN_FFMPEG
+
+    fondo = None
     ancho_video, alto_video = 1920, 1080
-    ancho_imagen, alto_imagen = imagen_pil.size
-    
-    escala_ancho = ancho_video / ancho_imagen
-    escala_alto = alto_video / alto_imagen
-    escala = min(escala_ancho, escala_alto)
-    
-    nuevo_ancho = int(ancho_imagen * escala)
-    nuevo_alto = int(alto_imagen * escala)
-    imagen_redimensionada = imagen_pil.resize((nuevo_ancho, nuevo_alto), Image.LANCZOS)
-    
-    x = (ancho_video - nuevo_ancho) // 2
-    y = (alto_video - nuevo_alto) // 2
-    
-    fondo = Image.new('RGB', (ancho_video, alto_video), color='black')
-    fondo.paste(imagen_redimensionada, (x, y))
-    
-    video = ImageClip(np.array(fondo))
-    video = video.set_duration(audio_final.duration)
-
-    video = video.fx(vfx.fadeout, duration=4)
-    video = video.fx(vfx.fadein, duration=4)
-
-    video_final = video.set_audio(audio_final)
+    if not usar_imagen_directa:
+        add_info("Procesando imagen...")
+
+        from PIL import Image
+
+        imagen_pil = Image.open(imagen_path)
+        # En JPEG, draft hace que libjpeg decodifique ya reducido (1/2, 1/4...)
+        # en vez de decodificar completo y reescalar después; en otros formatos
+        # no hace nada. Se pide el doble del destino para no perder nitidez.
+        imagen_pil.draft('RGB', (ancho_video * 2, alto_video * 2))
+        ancho_imagen, alto_imagen = imagen_pil.size
+
+        escala_ancho = ancho_video / ancho_imagen
+        escala_alto = alto_video / alto_imagen
+        escala = min(escala_ancho, escala_alto)
+
+        nuevo_ancho = int(ancho_imagen * escala)
+        nuevo_alto = int(alto_imagen * escala)
+        # reducing_gap añade una reducción entera previa barata antes del LANCZOS
+        imagen_redimensionada = imagen_pil.resize((nuevo_ancho, nuevo_alto), Image.LANCZOS,
+                                                  reducing_gap=3.0)
+
+        x = (ancho_video - nuevo_ancho) // 2
+        y = (alto_video - nuevo_alto) // 2
+
+        # Letterboxing vectorizado: lienzo negro preasignado y una sola copia
+        # de los píxeles de la imagen en lugar del paste de PIL
+        # convert solo si hace falta: para una fuente ya RGB la llamada
+        # duplicaría el buffer entero sin cambiar nada
+        if imagen_redimensionada.mode != 'RGB':
+            imagen_redimensionada = imagen_redimensionada.convert('RGB')
+        # Lienzo negro compuesto en PIL directamente: tobytes() entrega luego
+        # los píxeles rgb24 empaquetados sin pasar por una copia intermedia
+        fondo = Image.new('RGB', (ancho_video, alto_video))
+        fondo.paste(imagen_redimensionada, (x, y))
 
     add_info("Configurando parámetros de codificación...")
 
     if update_progress:
         update_progress(35)  # 35% del progreso después de procesar la imagen
 
+    # Si el binario no ofrece el encoder AMF pedido, avisar y codificar por CPU
+    if codec in ENCODERS_AMF and platform.system() == 'Windows':
+        capacidades = verificar_capacidades()
+        encoder_amf = ENCODERS_AMF[codec]
+        if not capacidades.get(encoder_amf):
+            add_info(f"El encoder {encoder_amf} no está disponible; se usará libx265 por CPU")
+            codec = 'none'
+
     # Configuración optimizada para AMD RADEON RX580 usando H.265 (HEVC) o H.264
-    if codec in ['h265', 'h264'] and platform.system() == 'Windows':
-        if codec == 'h264':
-            ffmpeg_params = [
-                "-c:v", "h264_amf",
-                "-quality", "quality",
-                "-rc", "vbr_latency",
-                "-qp_i", "18", "-qp_p", "20", "-qp_b", "22",
-                "-b:v", "10M",
-                "-maxrate", "15M",
-                "-bufsize", "15M",
-                "-g", "250",
-                "-bf", "3",
-                "-profile:v", "high",
-                "-level", "5.1"
-            ]
-        else:  # h265
-            ffmpeg_params = [
-                "-c:v", "hevc_amf",
-                "-quality", "quality",
-                "-rc", "vbr_latency",
-                "-qp_i", "18", "-qp_p", "20", "-qp_b", "22",
-                "-b:v", "10M",
-                "-maxrate", "15M",
-                "-bufsize", "15M",
-                "-g", "250",
-                "-bf", "3",
-                "-profile:v", "main",
-                "-level", "5.1"
-            ]
+    if codec in ENCODERS_AMF and platform.system() == 'Windows':
+        # AMF consume superficies NV12: entregar ese layout directamente
+        # ahorra el reempaquetado planar que haría falta desde yuv420p
+        formato_encoder = 'nv12'
+        if calidad not in ('speed', 'balanced', 'quality'):
+            calidad = 'balanced'
+        # -usage transcoding con CQP: sobre una imagen fija el objetivo de
+        # tasa-distorsión es muy laxo y vbr_latency con QPs apretados era el
+        # preset más lento de AMF sin ganancia visible. speed/balanced rinden
+        # 2-3x más en este contenido
+        ffmpeg_params = [
+            "-c:v", ENCODERS_AMF[codec],
+            "-usage", "transcoding",
+            "-quality", calidad,
+            "-rc", "cqp",
+            "-qp_i", "22", "-qp_p", "24",
+            "-g", "250",
+            "-bf", "0",
+            "-profile:v", "high" if codec == 'h264' else "main",
+            "-level", "5.1"
+        ]
     else:
-        ffmpeg_params = ["-c:v", "libx265", "-crf", "23", "-preset", "medium"]
+        formato_encoder = 'yuv420p'
+        # Contenido estático: GOP largo sin detección de cortes ni B-frames,
+        # así el encoder resuelve casi todos los macrobloques como "skip"
+        ffmpeg_params = ["-c:v", "libx265", "-crf", "23", "-preset", "medium",
+                         "-g", "600", "-keyint_min", "600", "-bf", "0", "-refs", "1",
+                         "-x265-params", "scenecut=0"]
+
+    # Sin muestreo de carga: psutil.cpu_percent(interval=1) añadía un
+    # segundo muerto antes de cada codificación para una decisión que el
+    # propio FFmpeg toma mejor. -threads 0 delega en su heurística;
+    # VIDEOGEN_THREADS permite forzar un valor, y con varios trabajos
+    # simultáneos se mantiene el reparto por trabajo.
+    try:
+        n_threads = int(os.environ.get('VIDEOGEN_THREADS', '0'))
+    except ValueError:
+        n_threads = 0
+    if n_threads <= 0:
+        n_threads = 0 if MAX_TRABAJOS_PARALELOS == 1 else HILOS_POR_TRABAJO
+
+    add_info("Iniciando la generación del video ({} hilos)...".format(
+        'auto' if n_threads == 0 else n_threads))
+
+    lista_path = os.path.join(_directorio_temporal(), 'lista_audio.txt')
+    escribir_lista_concat(rutas_audio, lista_path)
 
-    # Optimización: Ajustar el número de hilos basado en la carga del sistema
-    cpu_count = psutil.cpu_count(logical=False)
-    cpu_usage = psutil.cpu_percent(interval=1)
-    if cpu_usage < 50:
-        n_threads = cpu_count
+    # Los fundidos se calculan a partir de la duración sondeada en los
+    # metadatos, sin decodificar nada; el audio también se desvanece al final
+    inicio_fundido = max(duracion_total - 4, 0)
+    fundidos = ('fade=t=in:st=0:d=4,'
+                f'fade=t=out:st={inicio_fundido:.3f}:d=4,'
+                f'format={formato_encoder}')
+    if usar_imagen_directa:
+        # La imagen entra a 1 fps y fps=50 duplica el fotograma ya escalado:
+        # una sola decodificación y un solo escalado por segundo de entrada,
+        # no cincuenta, y el encoder ve copias idénticas (macrobloques skip)
+        filtro_video = ('scale=1920:1080:force_original_aspect_ratio=decrease:flags=lanczos,'
+                        'pad=1920:1080:(ow-iw)/2:(oh-ih)/2:color=black,'
+                        'fps=50,' + fundidos)
     else:
-        n_threads = max(1, cpu_count - 2)
+        # La imagen ya letterboxeada se emite una sola vez por stdin y
+        # FFmpeg la clona para generar los fotogramas restantes
+        filtro_video = 'tpad=stop_mode=clone:stop=-1,' + fundidos
+    filtro_audio = f'afade=t=out:st={inicio_fundido:.3f}:d=4'
 
-    add_info(f"Iniciando la generación del video con {n_threads} hilos...")
+    # Copiar el flujo excluye filtrarlo: al copiar se omite el afade de
+    # salida (el fundido de video sí se mantiene)
+    copiar_audio = puede_copiar_audio(rutas_audio)
 
-    # Crear un StdoutRedirector que use la función add_info y update_progress
-    redirector = StdoutRedirector(add_info, lambda p: update_progress(35 + p * 0.65) if update_progress else None)
+    # Un único grafo -filter_complex con etiquetas: el planificador de
+    # filtros de FFmpeg puede encadenar y paralelizar las pasadas dentro
+    # de un mismo grafo, cosa que no hace entre -vf y -af separados
+    grafo = f'[0:v]{filtro_video}[vsal]'
+    if not copiar_audio:
+        grafo += f';[1:a]{filtro_audio}[asal]'
 
-    # Redirigir la salida estándar y de error a nuestro redirector
-    old_stdout = sys.stdout
-    old_stderr = sys.stderr
-    sys.stdout = redirector
-    sys.stderr = redirector
+    # -progress emite pares clave=valor deterministas por stdout; -nostats
+    # suprime el refresco de progreso por stderr (que exigía regex por línea)
+    cmd_comun = ['-f', 'concat', '-safe', '0', '-i', lista_path,
+                 '-filter_complex', grafo,
+                 '-filter_complex_threads', str(max(2, (os.cpu_count() or 2) // 2)),
+                 '-map', '[vsal]',
+                 '-map', '1:a' if copiar_audio else '[asal]']
+    cmd_comun.extend(ffmpeg_params)
+    if copiar_audio:
+        add_info("Audio AAC homogéneo: se copia el flujo sin recodificar")
+        cmd_comun.extend(['-c:a', 'copy'])
+    elif verificar_capacidades().get('libfdk_aac'):
+        # Si la build trae libfdk_aac, preferirlo al aac nativo: mejor
+        # calidad por bit y más rápido; vbr 5 es su tramo alto (~224 kb/s)
+        cmd_comun.extend(['-c:a', 'libfdk_aac', '-vbr', '5'])
+    else:
+        cmd_comun.extend(['-c:a', 'aac', '-b:a', '320k'])
+    if output_path.lower().endswith(('.mp4', '.m4v', '.mov')):
+        # Adelanta el átomo moov al principio del archivo: la reproducción
+        # y el scrubbing empiezan sin leer antes el final del MP4
+        cmd_comun.extend(['-movflags', '+faststart'])
+    cmd_comun.extend(['-threads', str(n_threads),
+                      '-t', f'{duracion_total:.3f}',
+                      output_path])
+
+    if usar_imagen_directa:
+        cmd = [FFMPEG_PATH, '-y', '-progress', 'pipe:1', '-nostats',
+               '-loop', '1', '-framerate', '1', '-i', imagen_path] + cmd_comun
+        datos_entrada = None
+    else:
+        cmd = [FFMPEG_PATH, '-y', '-progress', 'pipe:1', '-nostats',
+               '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', '1920x1080', '-framerate', '50',
+               '-i', 'pipe:0'] + cmd_comun
+        datos_entrada = fondo.tobytes()
 
+    ruta_ppm = None
     try:
-        video_final.write_videofile(output_path, codec='libx265', audio_codec='aac', fps=50, 
-                                    preset='medium', audio_bitrate='320k', 
-                                    threads=n_threads, ffmpeg_params=ffmpeg_params)
+        # El semáforo limita cuántas codificaciones corren a la vez
+        with _semaforo_trabajos:
+            retorno, entrada_ok, ultimas = _ejecutar_ffmpeg(cmd, datos_entrada, duracion_total,
+                                                            add_info, update_progress)
+            if retorno != 0 and datos_entrada is not None and not entrada_ok:
+                # Algunas builds de FFmpeg no aceptan rawvideo por stdin;
+                # como alternativa se escribe un PPM sin compresión (P6 es
+                # cabecera + píxeles tal cual, nada de libjpeg)
+                add_info("La entrada por tubería falló; se reintenta con PPM temporal...")
+                ruta_ppm = os.path.join(_directorio_temporal(), 'fondo.ppm')
+                _escribir_ppm(fondo, ruta_ppm)
+                cmd_ppm = [FFMPEG_PATH, '-y', '-progress', 'pipe:1', '-nostats',
+                           '-loop', '1', '-framerate', '50', '-i', ruta_ppm] + cmd_comun
+                retorno, _, ultimas = _ejecutar_ffmpeg(cmd_ppm, None, duracion_total,
+                                                       add_info, update_progress)
     finally:
-        # Restaurar la salida estándar y de error
-        sys.stdout = old_stdout
-        sys.stderr = old_stderr
+        _borrar_temporales((lista_path, ruta_ppm))
+
+    if retorno != 0:
+        detalle = '\n'.join(linea.decode('utf-8', 'replace') for linea in ultimas)
+        raise Exception(f"FFmpeg terminó con código {retorno}\n{detalle}")
 
     add_info("Video generado con éxito.")
     if update_progress:
@@ -180,17 +659,59 @@ class Application(tk.Frame):
             application_path = os.path.dirname(os.path.abspath(__file__))
         icon_path = os.path.join(application_path, 'icon.ico')
         self.master.iconbitmap(icon_path)
+        self.icon_path = icon_path
+        self._icono_acerca = None
+        self._ventana_acerca = None
         
+        self.master.protocol('WM_DELETE_WINDOW', self.cerrar_aplicacion)
         self.pack(fill=tk.BOTH, expand=True)
-        self.codec_var = tk.StringVar(value="none")
+        self.configuracion = self._cargar_config()
+        # Restaurar la posición guardada evita el baile de centrar con
+        # update_idletasks y consultas winfo en cada arranque
+        geometria = self.configuracion.get('geometria')
+        if geometria:
+            try:
+                self.master.geometry(geometria)
+            except tk.TclError:
+                pass
+        self.codec_var = tk.StringVar(value=self.configuracion.get('codec', 'none'))
+        self.codec_var.trace_add('write', lambda *_: self._programar_guardado_config())
+        self.calidad_var = tk.StringVar(value=self.configuracion.get('calidad', 'balanced'))
+        self.calidad_var.trace_add('write', lambda *_: self._programar_guardado_config())
+        self._guardado_config_id = None
+        self._cola_info = queue.Queue()
+        self._cola_trabajos = queue.Queue()
+        self._hilo_trabajos = None
+        self._progreso_pendiente = None
+        self._ultimo_progreso_v = -1.0
         self.create_widgets()
+        self.master.after(75, self._drenar_info)
+        self.master.after(50, self._aplicar_progreso)
+        # Diferir el trabajo de arranque: la ventana se pinta primero y las
+        # comprobaciones llegan un instante después vía el bucle de eventos
+        self.master.after(50, self._tareas_arranque)
+
+    def _tareas_arranque(self):
+        self.comprobar_capacidades()
+        # El barrido borra árboles de directorios (E/S potencialmente lenta
+        # en discos de red): a un hilo de trabajo; add_info ya es una cola
+        threading.Thread(target=self._limpiar_temporales_hilo, daemon=True).start()
+
+    def _limpiar_temporales_hilo(self):
+        eliminados = limpiar_temporales()
+        if eliminados:
+            self.add_info(f"Eliminados {eliminados} directorios temporales de ejecuciones anteriores")
 
     def create_widgets(self):
         main_frame = ttk.Frame(self)
         main_frame.pack(padx=20, pady=20, fill=tk.BOTH, expand=True)
 
+        # Fuente con nombre registrada una sola vez: los widgets la
+        # referencian por nombre y Tk comparte la métrica cacheada en C.
+        # La referencia en self evita que el recolector borre la fuente.
+        self._fuente_botones = tkfont.Font(name='VGBoton', family='Arial', size=12)
         style = ttk.Style()
-        style.configure('TButton', font=('Arial', 12))
+        style.configure('TButton', font='VGBoton')
 
         selection_frame = ttk.Frame(main_frame)
         selection_frame.pack(fill=tk.X, pady=10)
@@ -207,8 +728,7 @@ class Application(tk.Frame):
         self.nombre_btn = ttk.Button(selection_frame, text="Especificar nombre del archivo", command=self.especificar_nombre_archivo)
         self.nombre_btn.grid(row=1, column=1, padx=5, pady=5, sticky="ew")
 
-        selection_frame.grid_columnconfigure(0, weight=1)
-        selection_frame.grid_columnconfigure(1, weight=1)
+        selection_frame.grid_columnconfigure((0, 1), weight=1)
 
         option_frame = ttk.Frame(main_frame)
         option_frame.pack(fill=tk.X, pady=10)
@@ -224,45 +744,233 @@ class Application(tk.Frame):
         self.generar_btn = ttk.Button(option_frame, text="Generar video", command=self.generar_video)
         self.generar_btn.pack(side=tk.RIGHT, padx=5)
 
+        calidad_frame = ttk.Frame(main_frame)
+        calidad_frame.pack(fill=tk.X, pady=(0, 10))
+
+        ttk.Label(calidad_frame, text="Preset AMF:").pack(side=tk.LEFT, padx=5)
+        self.calidad_radios = []
+        for etiqueta, valor in (("Velocidad", "speed"), ("Equilibrado", "balanced"), ("Calidad", "quality")):
+            radio = ttk.Radiobutton(calidad_frame, text=etiqueta,
+                                    variable=self.calidad_var, value=valor)
+            radio.pack(side=tk.LEFT, padx=5)
+            self.calidad_radios.append(radio)
+
         self.progress = ttk.Progressbar(main_frame, orient="horizontal", length=300, mode="determinate")
         self.progress.pack(fill=tk.X, pady=10)
 
         info_frame = ttk.Frame(main_frame)
         info_frame.pack(fill=tk.BOTH, expand=True, pady=10)
 
-        self.info_text = tk.Text(info_frame, height=10, wrap=tk.WORD)
-        self.info_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        # Sin ajuste de línea ni pila de deshacer: el reflujo por palabra y
+        # el historial de undo encarecen cada inserción en un panel de solo
+        # anexar; el desplazamiento horizontal cubre las líneas largas
+        self.info_text = tk.Text(info_frame, height=10, wrap=tk.NONE, undo=False)
+        self.info_text.grid(row=0, column=0, sticky="nsew")
 
         scrollbar = ttk.Scrollbar(info_frame, orient="vertical", command=self.info_text.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.info_text.configure(yscrollcommand=scrollbar.set)
+        scrollbar.grid(row=0, column=1, sticky="ns")
+
+        scrollbar_h = ttk.Scrollbar(info_frame, orient="horizontal", command=self.info_text.xview)
+        scrollbar_h.grid(row=1, column=0, sticky="ew")
+
+        self.info_text.configure(yscrollcommand=scrollbar.set, xscrollcommand=scrollbar_h.set)
+        info_frame.grid_rowconfigure(0, weight=1)
+        info_frame.grid_columnconfigure(0, weight=1)
+
+        botones_inferiores = ttk.Frame(main_frame)
+        botones_inferiores.pack(side=tk.BOTTOM, pady=10)
+
+        self.acerca_btn = ttk.Button(botones_inferiores, text="Acerca de", command=self.mostrar_acerca_de)
+        self.acerca_btn.pack(side=tk.LEFT, padx=5)
+
+        self.quit = ttk.Button(botones_inferiores, text="SALIR", command=self.cerrar_aplicacion)
+        self.quit.pack(side=tk.LEFT, padx=5)
+
+    def cerrar_aplicacion(self):
+        # Volcado síncrono al salir: cancela el debounce pendiente si lo
+        # hay y guarda también la geometría para restaurarla al arrancar
+        if self._guardado_config_id is not None:
+            self.master.after_cancel(self._guardado_config_id)
+        self.configuracion['geometria'] = self.master.geometry()
+        self._guardar_config()
+        self.master.destroy()
+
+    def mostrar_acerca_de(self):
+        # Ventana única: construirla cuesta una vez y las aperturas
+        # siguientes son un deiconify en lugar de recrear todos los widgets
+        if self._ventana_acerca is not None and self._ventana_acerca.winfo_exists():
+            self._ventana_acerca.deiconify()
+            self._ventana_acerca.lift()
+            return
+        ventana = tk.Toplevel(self.master)
+        ventana.title("Acerca de VideoGenerator")
+        ventana.resizable(False, False)
+        ventana.protocol('WM_DELETE_WINDOW', ventana.withdraw)
+        self._ventana_acerca = ventana
+        if self._icono_acerca is None:
+            # Preferir un PNG ya al tamaño final: tk.PhotoImage lo carga sin
+            # PIL ni remuestreo. Si no está junto al .ico, se recurre a PIL
+            # (una sola vez; el PhotoImage resultante queda cacheado).
+            ruta_png = os.path.join(os.path.dirname(self.icon_path), 'icon_96.png')
+            try:
+                self._icono_acerca = tk.PhotoImage(file=ruta_png)
+            except tk.TclError:
+                try:
+                    from PIL import Image, ImageTk
+                    with Image.open(self.icon_path) as imagen:
+                        self._icono_acerca = ImageTk.PhotoImage(
+                            imagen.resize((96, 96), Image.LANCZOS))
+                except Exception:
+                    self._icono_acerca = False  # no reintentar en cada apertura
+        if self._icono_acerca:
+            ttk.Label(ventana, image=self._icono_acerca).pack(pady=(15, 5))
+        ttk.Label(ventana, text="VideoGenerator v1.1").pack(pady=5)
+        ttk.Label(ventana, text="Generador de videos musicales a partir de una imagen estática").pack(padx=20)
+        ttk.Button(ventana, text="Cerrar", command=ventana.withdraw).pack(pady=10)
+
+    def _cargar_config(self):
+        try:
+            with open(RUTA_CONFIG, 'r', encoding='utf-8') as f:
+                configuracion = json.load(f)
+            return configuracion if isinstance(configuracion, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _programar_guardado_config(self):
+        # Agrupa varios clics seguidos en los radios en una sola escritura
+        if self._guardado_config_id is not None:
+            self.master.after_cancel(self._guardado_config_id)
+        self._guardado_config_id = self.master.after(500, self._guardar_config)
 
-        self.quit = ttk.Button(main_frame, text="SALIR", command=self.master.destroy)
-        self.quit.pack(side=tk.BOTTOM, pady=10)
+    def _guardar_config(self):
+        self._guardado_config_id = None
+        self.configuracion['codec'] = self.codec_var.get()
+        self.configuracion['calidad'] = self.calidad_var.get()
+        try:
+            with open(RUTA_CONFIG, 'w', encoding='utf-8') as f:
+                json.dump(self.configuracion, f)
+        except OSError:
+            pass
+
+    def comprobar_capacidades(self):
+        # El sondeo se hace en un hilo aparte: en el primer arranque (sin
+        # caché en disco) lanza un subproceso y bloquearía el primer pintado
+        threading.Thread(target=self._sondear_capacidades_hilo, daemon=True).start()
+
+    def _sondear_capacidades_hilo(self):
+        capacidades = verificar_capacidades()
+        self.master.after(0, self._aplicar_capacidades, capacidades)
+
+    def _aplicar_capacidades(self, capacidades):
+        if not capacidades['disponible']:
+            self.add_info("FFmpeg no encontrado: instala imageio-ffmpeg o añade ffmpeg al PATH")
+        if capacidades['h264_amf'] or capacidades['hevc_amf']:
+            self.add_info("Codificadores AMD AMF detectados")
+        else:
+            self.h265_radio['state'] = 'disabled'
+            self.h264_radio['state'] = 'disabled'
+            for radio in self.calidad_radios:
+                radio['state'] = 'disabled'
+            self.add_info("Codificadores AMD AMF no disponibles: se usará libx265 por software")
 
     def add_info(self, message):
-        self.info_text.insert(tk.END, str(message) + "\n")
-        self.info_text.see(tk.END)
-        self.info_text.update()
+        # Productor puro: el hilo de trabajo solo encola la línea. Todo el
+        # contacto con Tk ocurre en _drenar_info, que corre en el bucle de
+        # eventos; así ningún hilo ajeno toca widgets ni llama a after
+        self._cola_info.put_nowait(str(message) + "\n")
+
+    def _drenar_info(self):
+        partes = []
+        while True:
+            try:
+                partes.append(self._cola_info.get_nowait())
+            except queue.Empty:
+                break
+        lineas = ''.join(partes)
+        if lineas:
+            # Solo seguir el final si el usuario ya estaba abajo: si ha
+            # subido a leer algo, no arrancarle la vista de las manos
+            seguia_final = self.info_text.yview()[1] >= 1.0
+            # Una marca de tiempo por volcado, no por línea; el f-string
+            # sobre localtime evita la maquinaria de strftime en caliente
+            lt = time.localtime()
+            marca = f"[{lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}] "
+            self.info_text.insert(tk.END, marca + lineas)
+            # Recortar el historial para que cada inserción siga costando
+            # lo mismo aunque la sesión genere varios videos seguidos
+            total = int(self.info_text.index('end-1c').split('.')[0])
+            if total > MAX_LINEAS_INFO:
+                self.info_text.delete('1.0', f'{total - MAX_LINEAS_INFO}.0')
+            if seguia_final:
+                self.info_text.see(tk.END)
+        self.master.after(75, self._drenar_info)
 
     def update_progress(self, value):
-        self.progress['value'] = value
-        self.progress.update()
+        # Solo anota el último valor (asignación atómica, seguro desde el
+        # hilo de trabajo); el aplicador del bucle de eventos lo recoge
+        self._progreso_pendiente = value
+
+    def _aplicar_progreso(self):
+        # Colapsa las decenas de avisos por segundo de FFmpeg en como mucho
+        # veinte repintados de barra por segundo, siempre con el valor final
+        valor = self._progreso_pendiente
+        if valor is not None and valor != self._ultimo_progreso_v:
+            self._ultimo_progreso_v = valor
+            self.progress['value'] = valor
+        self.master.after(50, self._aplicar_progreso)
 
     def seleccionar_directorio(self):
-        self.directorio_audio = filedialog.askdirectory()
-        if self.directorio_audio:
-            self.add_info(f"Directorio de audio seleccionado: {self.directorio_audio}")
+        directorio = filedialog.askdirectory()
+        if directorio and directorio != getattr(self, 'directorio_audio', None):
+            self.directorio_audio = directorio
+            self.add_info(f"Directorio de audio seleccionado: {directorio}")
+            self._mostrar_orden_pistas()
+
+    def _mostrar_orden_pistas(self):
+        # Adelanta al usuario el orden que usará crear_video, con la misma
+        # clave precalculada por nombre (una pasada, no una por comparación)
+        claves = []
+        try:
+            with os.scandir(self.directorio_audio) as it:
+                for entrada in it:
+                    if not entrada.is_file(follow_symlinks=False):
+                        continue
+                    extension = entrada.name.rpartition('.')[2].lower()
+                    if extension in FORMATOS_AUDIO:
+                        claves.append((obtener_numero_pista(entrada.name), entrada.name))
+        except OSError:
+            return
+        claves.sort(key=operator.itemgetter(0))
+        lineas = [f"{len(claves)} pistas de audio encontradas:"]
+        lineas.extend(f"  {nombre}" for _, nombre in claves)
+        self.add_info('\n'.join(lineas))
 
     def seleccionar_imagen(self):
         self.imagen_path = filedialog.askopenfilename(filetypes=[("Image files", "*.jpg *.png")])
         if self.imagen_path:
             self.add_info(f"Imagen seleccionada: {self.imagen_path}")
+            # La lectura de cabecera sale del hilo de Tk: en una carpeta de
+            # red hasta abrir el archivo puede tardar, y el diálogo debe
+            # cerrarse al instante. El hilo publica en la cola de log.
+            threading.Thread(target=self._leer_dimensiones_imagen,
+                             args=(self.imagen_path,), daemon=True).start()
+
+    def _leer_dimensiones_imagen(self, imagen_path):
+        try:
+            from PIL import Image
+            # Image.open solo lee la cabecera; el with evita dejar el
+            # descriptor abierto al seleccionar varias veces
+            with Image.open(imagen_path) as imagen:
+                self.add_info(f"  {imagen.width}x{imagen.height} ({imagen.format})")
+        except Exception:
+            pass
 
     def seleccionar_directorio_salida(self):
-        self.directorio_salida = filedialog.askdirectory()
-        if self.directorio_salida:
-            self.add_info(f"Directorio de salida seleccionado: {self.directorio_salida}")
+        # Reelegir el mismo directorio no cambia nada: sin log ni rescaneo
+        directorio = filedialog.askdirectory()
+        if directorio and directorio != getattr(self, 'directorio_salida', None):
+            self.directorio_salida = directorio
+            self.add_info(f"Directorio de salida seleccionado: {directorio}")
 
     def especificar_nombre_archivo(self):
         self.nombre_archivo = simpledialog.askstring("Nombre del archivo", "Ingrese el nombre del archivo de video (sin extensión):")
@@ -284,7 +992,9 @@ class Application(tk.Frame):
         
         counter = 1
         nombre_base, extension = os.path.splitext(self.nombre_archivo)
-        while os.path.exists(output_path):
+        # lexists no resuelve enlaces simbólicos: un stat menos por vuelta y
+        # un enlace roto también cuenta como nombre ocupado
+        while os.path.lexists(output_path):
             output_path = os.path.join(self.directorio_salida, f"{nombre_base}_{counter}{extension}")
             counter += 1
 
@@ -298,13 +1008,31 @@ class Application(tk.Frame):
         self.salida_btn['state'] = 'disabled'
         self.nombre_btn['state'] = 'disabled'
         
-        # Iniciar la generación del video en un hilo separado
-        threading.Thread(target=self.generar_video_thread, args=(output_path,), daemon=True).start()
+        # Los parámetros se capturan al encolar: lo que el usuario cambie
+        # después no afecta a un trabajo ya en cola
+        self._encolar_trabajo((self.directorio_audio, self.imagen_path, output_path,
+                               self.codec_var.get(), self.calidad_var.get()))
+
+    def _encolar_trabajo(self, trabajo):
+        # Un único hilo de trabajo persistente consume la cola: los clics
+        # sucesivos se ordenan ahí en vez de crear un hilo por video, y los
+        # cachés calientes (sondas, capacidades) se reutilizan entre trabajos
+        self._cola_trabajos.put(trabajo)
+        if self._hilo_trabajos is None:
+            self._hilo_trabajos = threading.Thread(target=self._consumir_trabajos, daemon=True)
+            self._hilo_trabajos.start()
+
+    def _consumir_trabajos(self):
+        while True:
+            trabajo = self._cola_trabajos.get()
+            self.generar_video_thread(trabajo)
+            self._cola_trabajos.task_done()
 
-    def generar_video_thread(self, output_path):
+    def generar_video_thread(self, trabajo):
+        directorio_audio, imagen_path, output_path, codec, calidad = trabajo
         try:
-            crear_video(self.directorio_audio, self.imagen_path, output_path, 
-                        self.codec_var.get(), self.add_info, self.update_progress)
+            crear_video(directorio_audio, imagen_path, output_path,
+                        codec, calidad, self.add_info, self.update_progress)
             self.master.after(0, self.video_generado_exitosamente, output_path)
         except Exception as e:
             self.master.after(0, self.mostrar_error, str(e))
@@ -313,6 +1041,7 @@ class Application(tk.Frame):
 
     def video_generado_exitosamente(self, output_path):
         self.add_info(f"Video generado correctamente: {output_path}")
+        enviar_notificacion("VideoGenerator", f"Video generado: {os.path.basename(output_path)}")
         messagebox.showinfo("Éxito", f"Video generado correctamente: {output_path}")
 
     def mostrar_error(self, mensaje_error):
@@ -6,7 +6,7 @@ a = Analysis(['videogenerator.py'],
              pathex=[],
              binaries=[],
              datas=[('icon.ico', '.')],
-             hiddenimports=['moviepy.video.fx.all', 'moviepy.audio.fx.all'],
+             hiddenimports=[],
              hookspath=[],
              hooksconfig={},
              runtime_hooks=[],